@@ -2,27 +2,41 @@
 import os
 import sys
 import re
+import mmap
 import time
-import json
+import asyncio
 import struct
 import shutil
+import bisect
+import heapq
 import sqlite3
 import tempfile
 import binascii
 import threading
 import datetime
 import subprocess
+import functools
+import contextlib
+import collections
+import concurrent.futures
 import urllib.parse
-from collections import Counter
 from typing import Optional
 from pathlib import Path
 # PySide6 imports (ONLY PySide6 — NO PyQt5)
-from PySide6.QtCore import Qt, QCoreApplication, QTimer
+from PySide6.QtCore import (
+    Qt, QCoreApplication, QTimer, QFile, QIODevice, QSize, QRect, QPropertyAnimation, Signal
+)
 from PySide6.QtGui import QFontDatabase, QFont, QIcon, QPixmap
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QFrame, QLabel, QPushButton,
     QTextEdit, QMessageBox
 )
+from pymobiledevice3.exceptions import AfcException, AfcFileNotFoundError
+from pymobiledevice3.lockdown import create_using_usbmux
+from pymobiledevice3.services.afc import AfcService
+from pymobiledevice3.usbmux import create_mux, list_devices
+import requests
+import urllib3
 
 # Colorama fallback
 try:
@@ -32,8 +46,24 @@ except ImportError:
         def __getattr__(self, _): return ''
     Fore = Style = DummyColor()
 
+# Compiled Qt resources (pyside6-rcc resources.qrc -o resources_rc.py)
+try:
+    import resources_rc  # noqa: F401
+    HAS_QT_RESOURCES = True
+except ImportError:
+    HAS_QT_RESOURCES = False
+
+# GUID scans upper-case hex per chunk, so the regex needs no IGNORECASE
+HEX_UPPER = bytes.maketrans(b'abcdef', b'ABCDEF')
+GUID_SCAN_CHUNK = 4 << 20   # 4 MiB
+GUID_SCAN_OVERLAP = 64      # longer than a GUID, so one crossing a chunk edge is still seen
+GUID_WINDOW = 512           # bytes searched on each side of a BLDatabaseManager signature
+
+SUPPORTED_VERSIONS = frozenset({"26.0.1", "26.0", "18.7.2", "18.7.1"})
+
 
 # ——— Utility ———
+@functools.lru_cache(maxsize=None)
 def resource_path(relative_path: str) -> str:
     """
     Resolve resource path for:
@@ -71,8 +101,98 @@ def resource_path(relative_path: str) -> str:
     # 3) Development
     return str(Path(__file__).resolve().parent / relative_path)
 
+def asset_path(relative_path: str) -> str:
+    """Bundled UI asset: embedded Qt resource when compiled in, else a file on disk"""
+    if HAS_QT_RESOURCES:
+        return f":/{relative_path}"
+    return resource_path(relative_path)
+
+@contextlib.contextmanager
+def mmap_file(path: str):
+    """Map a file read-only instead of copying it into memory (empty files yield b'')"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            # Scans run front to back: let the kernel read ahead aggressively
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        try:
+            yield mm
+        finally:
+            mm.close()
+
+def tree_size(root: str, limit: Optional[int] = None) -> int:
+    """
+    Total size of regular files under root; scandir supplies file types without extra stat() calls.
+    With limit, the walk stops as soon as the total reaches it.
+    """
+    total = 0
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    total += entry.stat(follow_symlinks=False).st_size
+                    if limit is not None and total >= limit:
+                        return total
+    return total
+
+def http_session() -> requests.Session:
+    """Keep-alive HTTP session, TLS unchecked like `curl -k`; not shared between threads"""
+    session = requests.Session()
+    session.verify = False
+    return session
+
+async def read_device_values() -> dict:
+    """Lockdown values of the attached device (ProductType, UniqueDeviceID, ...)"""
+    async with await create_using_usbmux() as lockdown:
+        return dict(lockdown.all_values)
+
+async def open_afc() -> AfcService:
+    """Connected AFC session on the attached device; release it with close_afc()"""
+    lockdown = await create_using_usbmux()
+    afc = AfcService(lockdown=lockdown)
+    try:
+        await afc.connect()
+    except BaseException:
+        await lockdown.close()
+        raise
+    return afc
+
+async def close_afc(afc: AfcService):
+    try:
+        await afc.close()
+    finally:
+        await afc.lockdown.close()
+
 # ——— Main Window Class ———
 class MainWindow(QMainWindow):
+    # Worker threads ask the GUI thread for a manual reboot; the Event is set once the dialog closes
+    askRebootSignal = Signal(str, object)
+    # Progress bar width in px; animated on the GUI thread
+    progressSignal = Signal(int)
+    # Device watcher thread hands the lockdown values of a connected device to the GUI thread
+    deviceFoundSignal = Signal(object)
+    # Failure text for the activate button; the progress bar turns red
+    errorSignal = Signal(str)
+
+    # Compiled once at import, shared by every scan
+    GUID_REGEX = re.compile(r'[0-9A-F]{8}-[0-9A-F]{4}-[0-9A-F]{4}-[0-9A-F]{4}-[0-9A-F]{12}', re.IGNORECASE)
+    # RFC 4122 version 4 / variant 1, uppercase (as normalized by the extractors)
+    GUID_V4_REGEX = re.compile(r'[0-9A-F]{8}-[0-9A-F]{4}-4[0-9A-F]{3}-[89AB][0-9A-F]{3}-[0-9A-F]{12}')
+    # Same rule as GUID_V4_REGEX, so the scan only yields GUIDs that pass validate_guid_structure
+    GUID_BYTES_REGEX = re.compile(rb'[0-9A-F]{8}-[0-9A-F]{4}-4[0-9A-F]{3}-[89AB][0-9A-F]{3}-[0-9A-F]{12}')
+
+    # tracev3 signatures; the BLDatabase* variants share a prefix and come out of one find() pass
+    SIG_BLDB = b'BLDatabase'
+    SIG_BLDB_MANAGER = b'BLDatabaseManager'
+    SIG_BLDB_SQLITE = b'BLDatabaseManager.sqlite'
+    SIG_BOOKASSETD_STORE = b'bookassetd [Database]: Store is at file:///private/var/containers/Shared/SystemGroup'
+
     def __init__(self):
         # 🔑 MUST be FIRST
         super().__init__()
@@ -81,18 +201,24 @@ class MainWindow(QMainWindow):
         self.setFixedSize(909, 540)
 
         # Load custom font
-        font_path = resource_path("fonts/FuturaCyrillicBold.ttf")
-        if os.path.exists(font_path):
-            font_id = QFontDatabase.addApplicationFont(font_path)
+        font_path = asset_path("fonts/FuturaCyrillicBold.ttf")
+        font_file = QFile(font_path)
+        if font_file.open(QIODevice.ReadOnly):
+            # Embedded resource: the bytes are already in memory, no file open
+            font_id = QFontDatabase.addApplicationFontFromData(font_file.readAll())
+            font_file.close()
             if font_id == -1:
                 print("[WARN] Failed to load custom font")
         else:
             print(f"[INFO] Font not found: {font_path}")
 
+        # Decoded images, shared by every label that shows them
+        self._pix_cache = {}
+
         # Set window icon
-        icon_path = resource_path("img/logo.png")
-        if os.path.exists(icon_path):
-            self.setWindowIcon(QIcon(icon_path))
+        icon_pix = self._pix("img/logo.png")
+        if not icon_pix.isNull():
+            self.setWindowIcon(QIcon(icon_pix))
 
         # Extend PATH for CLI tools (macOS/Homebrew)
         extra_paths = [
@@ -100,6 +226,7 @@ class MainWindow(QMainWindow):
             "/opt/homebrew/bin", "/opt/homebrew/sbin"
         ]
         os.environ["PATH"] = os.pathsep.join(extra_paths) + os.pathsep + os.environ.get("PATH", "")
+        self.verify_dependencies()
 
         # UI config & state
         self.api_url = "https://codex-r1nderpest-a12.ru/get2.php"
@@ -116,19 +243,51 @@ class MainWindow(QMainWindow):
         self.max_attempts = 5
         self.global_GUID = ""
         self.BLDB_FILENAME = "BLDatabaseManager.sqlite"
-        self.GUID_REGEX = re.compile(r'[0-9A-F]{8}-[0-9A-F]{4}-[0-9A-F]{4}-[0-9A-F]{4}-[0-9A-F]{12}', re.IGNORECASE)
         self.temp_dir = tempfile.gettempdir()
+        # Syslog archives of this run; reused across attempts, removed by _cleanup()
+        self._archive_dir = os.path.join(self.temp_dir, f"rustA12_{os.getpid()}")
+        # Background deletions started by _discard_tree(), joined in _cleanup()
+        self._trash_threads = []
+
+        # HTTP session of the workflow thread (keeps connections alive); parallel preloads use their own
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        self.http = http_session()
+
+        # pymobiledevice3 is asyncio-based; its calls run on one background loop
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        # Shared AFC session, opened on first use and dropped when the device reboots
+        self.afc = None
 
         # Setup UI and connections
         self.setupUi()
         self.setupConnections()
 
-        # Start device watcher
-        threading.Thread(target=self.SearchingDevices, daemon=True).start()
+        # Start device watcher: a task on the device loop driven by usbmuxd attach events (no polling, no thread)
+        self._device_watch = asyncio.run_coroutine_threadsafe(self.watchDevices(), self._loop)
 
         # Bottom console
         self.setupConsole()
 
+    def _pix(self, rel: str) -> QPixmap:
+        """Load an image once and reuse the (implicitly shared) QPixmap"""
+        pix = self._pix_cache.get(rel)
+        if pix is None:
+            pix = QPixmap(asset_path(rel))
+            self._pix_cache[rel] = pix
+        return pix
+
+    def _scaled_pix(self, rel: str, size: QSize) -> QPixmap:
+        """Pixmap pre-scaled to a label's size (at device pixel ratio), so paints draw it 1:1"""
+        dpr = self.devicePixelRatioF()
+        key = (rel, size.width(), size.height(), dpr)
+        pix = self._pix_cache.get(key)
+        if pix is None:
+            pix = self._pix(rel).scaled(size * dpr, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+            pix.setDevicePixelRatio(dpr)
+            self._pix_cache[key] = pix
+        return pix
+
     def setupUi(self):
         # Central widget
         self.centralwidget = QWidget(self)
@@ -137,35 +296,35 @@ class MainWindow(QMainWindow):
         # ——— Intro Frame ———
         self.Intro = QFrame(self.centralwidget)
         self.Intro.setGeometry(-10, -10, 921, 601)
-        self.Intro.setStyleSheet(
-            "background-color: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0, "
-            "stop:0 rgba(25, 25, 25, 255), stop:1 rgba(1, 27, 59, 255));"
-            "border-radius: 0px;"
-        )
+        # Shared rules for the page, like HomePage: labels are white on transparent unless they set their own
+        self.Intro.setStyleSheet("""
+            * {
+                background-color: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0,
+                    stop:0 rgba(25, 25, 25, 255), stop:1 rgba(1, 27, 59, 255));
+                border-radius: 0px;
+            }
+            QLabel {
+                color: white;
+                background-color: transparent;
+            }
+        """)
 
         self.label_glow_phone = QLabel(self.Intro)
         self.label_glow_phone.setGeometry(400, 0, 601, 551)
-        self.label_glow_phone.setPixmap(QPixmap(resource_path("img/glow_phone.png")))
-        self.label_glow_phone.setScaledContents(True)
-        self.label_glow_phone.setStyleSheet("background-color: transparent;") 
+        self.label_glow_phone.setPixmap(self._scaled_pix("img/glow_phone.png", self.label_glow_phone.size()))
 
         self.label_title = QLabel("Welcome to Rust_A12+!", self.Intro)
         self.label_title.setGeometry(40, 210, 671, 51)
         self.label_title.setFont(QFont("Futura Cyrillic Bold", 30, QFont.Bold))
-        self.label_title.setStyleSheet("color: white; background-color: transparent;")
 
         self.label_bg_glow = QLabel(self.Intro)
         self.label_bg_glow.setGeometry(-20, 60, 961, 531)
-        self.label_bg_glow.setPixmap(QPixmap(resource_path("img/bg_GLOW.png")))
-        self.label_bg_glow.setScaledContents(True)
-        self.label_bg_glow.setStyleSheet("background-color: transparent;") 
+        self.label_bg_glow.setPixmap(self._scaled_pix("img/bg_GLOW.png", self.label_bg_glow.size()))
 
 
         self.label_logo = QLabel(self.Intro)
         self.label_logo.setGeometry(80, 110, 371, 131)
-        self.label_logo.setPixmap(QPixmap(resource_path("img/logo.png")))
-        self.label_logo.setScaledContents(True)
-        self.label_logo.setStyleSheet("background-color: transparent;")
+        self.label_logo.setPixmap(self._scaled_pix("img/logo.png", self.label_logo.size()))
 
         self.label_desc = QLabel(
             "Welcome to RustA12+! This tool helps bypass iCloud on all ipad and iPhone Xr – 17 Pro Max"
@@ -185,7 +344,6 @@ class MainWindow(QMainWindow):
         self.label_status = QLabel("⌛️ Searching for devices...", self.Intro)
         self.label_status.setGeometry(110, 370, 311, 41)
         self.label_status.setFont(QFont("Futura Cyrillic Bold", 14, QFont.Bold))
-        self.label_status.setStyleSheet("color: white; background-color: transparent;")
         self.label_status.setAlignment(Qt.AlignCenter)
 
         # Raise in order
@@ -199,52 +357,53 @@ class MainWindow(QMainWindow):
         # ——— HomePage Frame ———
         self.HomePage = QFrame(self.centralwidget)
         self.HomePage.setGeometry(0, -10, 921, 601)
-        self.HomePage.setStyleSheet(
-            "background-color: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0, "
-            "stop:0 rgba(25, 25, 25, 255), stop:1 rgba(1, 27, 59, 255));"
-        )
+        # Shared rules for the page; parsed once instead of per child widget
+        self.HomePage.setStyleSheet("""
+            * {
+                background-color: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0,
+                    stop:0 rgba(25, 25, 25, 255), stop:1 rgba(1, 27, 59, 255));
+            }
+            QLabel {
+                color: white;
+                background-color: transparent;
+            }
+            QFrame#statusRow {
+                background-color: rgba(0, 0, 0, 46);
+                border-radius: 10px;
+            }
+        """)
         self.label_cable = QLabel(self.HomePage)
         self.label_cable.setGeometry(50, 450, 221, 151)
-        self.label_cable.setPixmap(QPixmap(resource_path("img/cable.png")))
-        self.label_cable.setScaledContents(True)
-        self.label_cable.setStyleSheet("background-color: transparent;") 
+        self.label_cable.setPixmap(self._scaled_pix("img/cable.png", self.label_cable.size()))
 
         # Device image
         self.label_ios26 = QLabel(self.HomePage)
         self.label_ios26.setGeometry(60, 70, 201, 421)
-        self.label_ios26.setPixmap(QPixmap(resource_path("img/ios26hello.png")))
-        self.label_ios26.setScaledContents(True)
-        self.label_ios26.setStyleSheet("background-color: transparent;")
+        self.label_ios26.setPixmap(self._scaled_pix("img/ios26hello.png", self.label_ios26.size()))
         # Labels
         self.DeviceName = QLabel("Device Name", self.HomePage)
         self.DeviceName.setGeometry(330, 100, 491, 41)
         self.DeviceName.setFont(QFont("Futura Cyrillic Bold", 28, QFont.Bold))
-        self.DeviceName.setStyleSheet("color: white; background-color: transparent;")
 
         self.UDID = QLabel("UDID: ", self.HomePage)
         self.UDID.setGeometry(340, 160, 491, 41)
         self.UDID.setFont(QFont("Futura Cyrillic Bold", 16, QFont.Bold))
-        self.UDID.setStyleSheet("color: white; background-color: transparent;")
 
         self.iOSVersion = QLabel("iOS Version: ", self.HomePage)
         self.iOSVersion.setGeometry(340, 210, 491, 41)
         self.iOSVersion.setFont(QFont("Futura Cyrillic Bold", 16, QFont.Bold))
-        self.iOSVersion.setStyleSheet("color: white; background-color: transparent;")
 
         self.ProductType = QLabel("Product Type: ", self.HomePage)
         self.ProductType.setGeometry(340, 260, 491, 41)
         self.ProductType.setFont(QFont("Futura Cyrillic Bold", 16, QFont.Bold))
-        self.ProductType.setStyleSheet("color: white; background-color: transparent;")
 
         self.ActivationState = QLabel("Activation Status: Unactivated", self.HomePage)
         self.ActivationState.setGeometry(340, 310, 491, 41)
         self.ActivationState.setFont(QFont("Futura Cyrillic Bold", 16, QFont.Bold))
-        self.ActivationState.setStyleSheet("color: white; background-color: transparent;")
 
         self.ProductType_2 = QLabel("Your device is", self.HomePage)
         self.ProductType_2.setGeometry(340, 360, 200, 41)
         self.ProductType_2.setFont(QFont("Futura Cyrillic Bold", 16, QFont.Bold))
-        self.ProductType_2.setStyleSheet("color: white; background-color: transparent;")
 
         self.ProductType_3 = QLabel("SUPPORTED!", self.HomePage)
         self.ProductType_3.setGeometry(480, 360, 400, 41)
@@ -255,14 +414,12 @@ class MainWindow(QMainWindow):
         for y in [160, 210, 260, 310, 360]:
             frame = QFrame(self.HomePage)
             frame.setGeometry(330, y, 501, 41)
-            frame.setStyleSheet("background-color: rgba(0, 0, 0, 46); border-radius: 10px;")
+            frame.setObjectName("statusRow")
 
         # Logo & cable
         self.label_logo_top = QLabel(self.HomePage)
         self.label_logo_top.setGeometry(640, 10, 281, 101)
-        self.label_logo_top.setPixmap(QPixmap(resource_path("img/logo.png")))
-        self.label_logo_top.setScaledContents(True)
-        self.label_logo_top.setStyleSheet("background-color: transparent;")
+        self.label_logo_top.setPixmap(self._scaled_pix("img/logo.png", self.label_logo_top.size()))
 
 
 
@@ -285,25 +442,31 @@ class MainWindow(QMainWindow):
         self.pb = QFrame(self.pbFrame)
         self.pb.setGeometry(0, 0, 0, 12)
         self.pb.setStyleSheet("background-color: rgb(19, 159, 255); border-radius: 5px;")
+        self._pb_anim = QPropertyAnimation(self.pb, b"geometry", self)
+        self._pb_anim.setDuration(200)
 
         # ——— Done Frame ———
         self.Done = QFrame(self.centralwidget)
         self.Done.setGeometry(0, -10, 921, 601)
-        self.Done.setStyleSheet(
-            "background-color: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0, "
-            "stop:0 rgba(25, 25, 25, 255), stop:1 rgba(1, 27, 59, 255));"
-        )
+        self.Done.setStyleSheet("""
+            * {
+                background-color: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0,
+                    stop:0 rgba(25, 25, 25, 255), stop:1 rgba(1, 27, 59, 255));
+            }
+            QLabel {
+                color: white;
+                background-color: transparent;
+            }
+        """)
 
         self.label_done_ios = QLabel(self.Done)
         self.label_done_ios.setGeometry(60, 70, 201, 421)
-        self.label_done_ios.setPixmap(QPixmap(resource_path("img/ios26hello.png")))
-        self.label_done_ios.setScaledContents(True)
+        self.label_done_ios.setPixmap(self._scaled_pix("img/ios26hello.png", self.label_done_ios.size()))
         
 
         self.DeviceName_3 = QLabel("Done!", self.Done)
         self.DeviceName_3.setGeometry(330, 100, 491, 41)
         self.DeviceName_3.setFont(QFont("Futura", 36))
-        self.DeviceName_3.setStyleSheet("color: white; background-color: transparent;")
 
         self.UDID_3 = QLabel(
             "Thank you for using Rust_A12+! Your device has been successfully activated! "
@@ -313,21 +476,16 @@ class MainWindow(QMainWindow):
         )
         self.UDID_3.setGeometry(330, 160, 491, 171)
         self.UDID_3.setFont(QFont("Futura", 18))
-        self.UDID_3.setStyleSheet("color: white; background-color: transparent;")
         self.UDID_3.setAlignment(Qt.AlignTop | Qt.AlignLeft)
         self.UDID_3.setWordWrap(True)
 
         self.label_done_cable = QLabel(self.Done)
         self.label_done_cable.setGeometry(50, 450, 221, 151)
-        self.label_done_cable.setPixmap(QPixmap(resource_path("img/cable.png")))
-        self.label_done_cable.setScaledContents(True)
-        self.label_done_cable.setStyleSheet("background-color: transparent;")
+        self.label_done_cable.setPixmap(self._scaled_pix("img/cable.png", self.label_done_cable.size()))
 
         self.label_done_logo = QLabel(self.Done)
         self.label_done_logo.setGeometry(640, 10, 281, 101)
-        self.label_done_logo.setPixmap(QPixmap(resource_path("img/logo.png")))
-        self.label_done_logo.setScaledContents(True)
-        self.label_done_logo.setStyleSheet("background-color: transparent;")  # 👈 ДОБАВЛЕНО
+        self.label_done_logo.setPixmap(self._scaled_pix("img/logo.png", self.label_done_logo.size()))
 
         self.backToHomePage = QPushButton("◁️ Back to Home Page", self.Done)
         self.backToHomePage.setGeometry(330, 440, 481, 41)
@@ -347,6 +505,10 @@ class MainWindow(QMainWindow):
     def setupConnections(self):
         self.activateButton.clicked.connect(self.StartThread)
         self.backToHomePage.clicked.connect(lambda: [self.Done.hide(), self.HomePage.show()])
+        self.askRebootSignal.connect(self.askReboot)
+        self.progressSignal.connect(self._animateProgress)
+        self.deviceFoundSignal.connect(self.SearchingDevices)
+        self.errorSignal.connect(self._showError)
 
     def setupConsole(self):
         self.console_frame = QFrame(self.centralwidget)
@@ -380,8 +542,24 @@ class MainWindow(QMainWindow):
 
         self.console_frame.show()
         self.console.show()
+
+        # log() only queues lines (from any thread); the GUI thread appends them in batches
+        self._log_buf = collections.deque()
+        self._log_timer = QTimer(self)
+        self._log_timer.setInterval(50)
+        self._log_timer.timeout.connect(self._flush_log)
+        self._log_timer.start()
         print('v1.5 snapshot 25122025')
 
+    def _flush_log(self):
+        lines = []
+        while self._log_buf:
+            lines.append(self._log_buf.popleft())
+        if lines:
+            self.console.append("<br>".join(lines))
+            scrollbar = self.console.verticalScrollBar()
+            scrollbar.setValue(scrollbar.maximum())
+
     ## Utility Methods
     def _run_cmd(self, cmd, timeout=None):
         """Run a subprocess command, return (returncode, stdout, stderr)"""
@@ -393,26 +571,82 @@ class MainWindow(QMainWindow):
         except Exception as e:
             return 1, "", str(e)
 
-    def _curl_download(self, url, filename):
-        """Download file to /tmp, return full path on success, else False"""
+    def _await(self, coro, timeout=None):
+        """Run a pymobiledevice3 coroutine on the device loop, return its result"""
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            # Stop it on the loop too, before callers tear down the session it is using
+            future.cancel()
+            raise
+
+    def _afc_call(self, method: str, *args, timeout=60):
+        """Run an AfcService method on the shared session; a broken session is dropped"""
+        if self.afc is None:
+            self.afc = self._await(open_afc(), timeout=30)
+        try:
+            return self._await(getattr(self.afc, method)(*args), timeout)
+        except AfcException:
+            raise
+        except Exception:
+            # Connection lost (e.g. device rebooted): reconnect on next call
+            self._close_afc()
+            raise
+
+    def _close_afc(self):
+        afc, self.afc = self.afc, None
+        if afc is not None:
+            try:
+                self._await(close_afc(afc), timeout=10)
+            except Exception:
+                pass
+
+    def _attached_udids(self) -> list:
+        """UDIDs of the devices usbmuxd lists right now (no subprocess spawn)"""
+        try:
+            return [device.serial for device in self._await(list_devices(), timeout=5)]
+        except Exception:
+            return []
+
+    def _device_attached(self) -> bool:
+        """Ask usbmuxd whether the detected device (any device before detection) is attached"""
+        attached = self._attached_udids()
+        udid = self.device_info.get("UniqueDeviceID")
+        return udid in attached if udid else bool(attached)
+
+    def _curl_download(self, url, filename, session=None):
+        """Download file to /tmp (streamed in-process), return full path on success, else False"""
         full_path = os.path.join(self.temp_dir, filename)
-        if os.path.exists(full_path):
+        try:
+            os.remove(full_path)
+        except OSError:  # usually FileNotFoundError: nothing to replace
+            pass
+        self.log(f"Starting download: {url}", "info")
+        # Stream into a side file; only a complete download is moved into place
+        part_path = full_path + ".part"
+        try:
+            with (session or self.http).get(url, stream=True, timeout=30) as r:
+                self.log(f"HTTP status: {r.status_code}", "info")
+                r.raise_for_status()
+                with open(part_path, 'wb') as f:
+                    for chunk in r.iter_content(chunk_size=1 << 20):
+                        f.write(chunk)
+            os.replace(part_path, full_path)
+        except (requests.RequestException, OSError) as e:
             try:
-                os.remove(full_path)
-            except:
+                os.remove(part_path)
+            except OSError:
                 pass
-        curl_cmd = ["curl", "-L", "-k", "-f", "-o", full_path, url]
-        self.log(f"Starting download: {' '.join(curl_cmd)}", "info")
-        code, out, err = self._run_cmd(curl_cmd)
-        self.log(f"cURL exit code: {code}", "info")
-        if code != 0:
-            if err:
-                self.log(f"cURL error: {err.strip()}", "error")
+            self.log(f"Download error: {e}", "error")
             self.log("Download failed", "error")
             return False
-        if os.path.exists(full_path) and os.path.getsize(full_path) > 100:
-            size_mb = os.path.getsize(full_path) / (1024 * 1024)
-            self.log(f"Successfully downloaded {filename}: ~{size_mb:.2f} MB", "success")
+        try:
+            size = os.stat(full_path).st_size
+        except FileNotFoundError:
+            size = 0
+        if size > 100:
+            self.log(f"Successfully downloaded {filename}: ~{size / (1024 * 1024):.2f} MB", "success")
             return full_path
         else:
             self.log("Downloaded file is empty or missing", "error")
@@ -421,62 +655,91 @@ class MainWindow(QMainWindow):
     def reboot_device(self):
         """Reboot device and wait for it to reconnect"""
         self.log("Rebooting device...", "info")
+        self._close_afc()
         # Try pymobiledevice3 first
-        code, _, err = self._run_cmd(["pymobiledevice3", "restart"])
+        code, _, err = self._run_cmd([self._bin["pymobiledevice3"], "restart"])
         if code != 0:
-            code, _, err = self._run_cmd(["idevicediagnostics", "restart"])
+            code, _, err = self._run_cmd([self._bin["idevicediagnostics"], "restart"])
             if code != 0:
                 self.log(f"Soft reboot failed: {err}", "warn")
-                self.log("Please reboot device manually and press Enter to continue...", "warn")
-                input()
+                self.log("Please reboot device manually and press OK to continue...", "warn")
+                text = "Soft reboot failed. Please reboot the device manually, then press OK."
+                done = threading.Event()
+                if threading.current_thread() is threading.main_thread():
+                    self.askReboot(text, done)
+                else:
+                    self.askRebootSignal.emit(text, done)
+                    done.wait()
                 return True
         self.log("Reboot command sent. Waiting for device to reconnect...", "info")
-        for i in range(60):  # up to 5 minutes
-            time.sleep(5)
-            code, _, _ = self._run_cmd(["ideviceinfo"])
-            if code == 0:
-                self.log(f"Device reconnected after {i * 5} seconds", "success")
-                time.sleep(10)  # extra stabilization time
+        # usbmuxd keeps listing the device until it has actually gone down
+        deadline = time.monotonic() + 30
+        while self._device_attached() and time.monotonic() < deadline:
+            time.sleep(0.2)
+        # extra 10s stabilization time once it is back
+        return self._wait_for_device(self.timeouts['reboot_wait'], settle=10)
+
+    def _wait_for_device(self, timeout_sec: int, settle: int = 5) -> bool:
+        """Wait for usbmuxd to list the detected device within timeout_sec seconds."""
+        start = time.monotonic()
+        next_report = 30
+        while time.monotonic() - start < timeout_sec:
+            if self._device_attached():
+                self.log(f"Device reconnected after {int(time.monotonic() - start)}s", "success")
+                time.sleep(settle)
                 return True
-            if i % 6 == 0:
-                self.log(f"Still waiting... ({i * 5} seconds)", "info")
-        self.log("Device did not reconnect in time", "error")
-        return False
-
-    def _wait_for_device(self, timeout_sec: int) -> bool:
-        """Wait for ideviceinfo to succeed within timeout_sec seconds."""
-        start = time.time()
-        while time.time() - start < timeout_sec:
-            code, _, _ = self._run_cmd(["ideviceinfo"], timeout=5)
-            if code == 0:
-                self.log(f"Device reconnected after {int(time.time() - start)}s", "success")
-                time.sleep(5)
-                return True
-            time.sleep(2)
+            elapsed = time.monotonic() - start
+            if elapsed >= next_report:
+                self.log(f"Still waiting... ({int(elapsed)} seconds)", "info")
+                next_report += 30
+            time.sleep(0.2)
         self.log(f"Timed out waiting for device ({timeout_sec}s)", "error")
         return False
 
     def verify_dependencies(self):
+        """Resolve CLI tools once; later spawns use absolute paths and skip the PATH search"""
         self.log("Verifying system dependencies...", "info")
+        self._bin = {
+            name: shutil.which(name) or name
+            for name in ("pymobiledevice3", "idevicediagnostics")
+        }
+        self._bin["log"] = shutil.which("/usr/bin/log")
+        for name, path in self._bin.items():
+            if not path or not os.path.isabs(path):
+                self.log(f"{name} not found in PATH", "warn")
         self.afc_mode = "pymobiledevice3"
         self.log(f"AFC Transfer Mode: {self.afc_mode}", "info")
 
+    def _discard_tree(self, path: str):
+        """Move a directory out of the way at once and delete it on a background thread"""
+        trash = f"{path}.{time.monotonic_ns()}.trash"
+        try:
+            os.rename(path, trash)
+        except FileNotFoundError:
+            return
+        except OSError:
+            shutil.rmtree(path, ignore_errors=True)
+            return
+        t = threading.Thread(target=shutil.rmtree, args=(trash,), kwargs={'ignore_errors': True}, daemon=True)
+        t.start()
+        self._trash_threads.append(t)
+
     def _cleanup(self):
         """Cleanup on exit"""
-        pass
+        self._device_watch.cancel()
+        self._close_afc()
+        for t in self._trash_threads:
+            t.join()
+        shutil.rmtree(self._archive_dir, ignore_errors=True)
 
     def detect_device(self):
-        """Fetch device info via ideviceinfo"""
+        """Fetch device info from lockdownd (in-process, no ideviceinfo spawn)"""
         self.log("Detecting device...", "info")
-        code, out, err = self._run_cmd(["ideviceinfo"])
-        if code != 0:
-            self.log(f"Device not found. Error: {err or 'Unknown'}", "error")
+        try:
+            info = self._await(read_device_values(), timeout=30)
+        except Exception as e:
+            self.log(f"Device not found. Error: {str(e) or 'Unknown'}", "error")
             sys.exit(1)
-        info = {}
-        for line in out.splitlines():
-            if ": " in line:
-                key, val = line.split(": ", 1)
-                info[key.strip()] = val.strip()
         self.device_info = info
         udid = info.get('UniqueDeviceID', '?')
         self.log(f"UDID: {udid}", "info")
@@ -486,43 +749,50 @@ class MainWindow(QMainWindow):
     def collect_syslog_archive(self, archive_path: str, timeout: int = 200) -> bool:
         """Collect syslog as logarchive using pymobiledevice3"""
         self.log(f"[+] Collecting syslog archive → {os.path.basename(archive_path)} (timeout {timeout}s)", "info")
-        cmd = ["pymobiledevice3", "syslog", "collect", archive_path]
+        cmd = [self._bin["pymobiledevice3"], "syslog", "collect", archive_path]
         code, _, err = self._run_cmd(cmd, timeout=timeout + 30)
         if not os.path.isdir(archive_path):
             self.log("[-] Archive directory not created", "error")
             return False
-        total_size = sum(
-            os.path.getsize(os.path.join(dirpath, f))
-            for dirpath, _, filenames in os.walk(archive_path)
-            for f in filenames
-            if os.path.isfile(os.path.join(dirpath, f))
-        )
-        size_mb = total_size // (1024 * 1024)
-        if total_size < 10_000_000:  # <10 MB
-            self.log(f"[-] Archive too small ({size_mb} MB)", "error")
+        min_size = 10_000_000  # 10 MB
+        # Only the threshold matters, so stop stat()ing once it is reached
+        total_size = tree_size(archive_path, limit=min_size)
+        if total_size < min_size:
+            self.log(f"[-] Archive too small ({total_size // 1_000_000} MB)", "error")
             return False
-        self.log(f"[✓] Archive collected: ~{size_mb} MB", "success")
+        # The walk stopped at the threshold, so the threshold is what we know
+        self.log(f"[✓] Archive collected: ≥{min_size // 1_000_000} MB", "success")
         return True
 
     def extract_guid_from_archive(self, archive_path: str) -> Optional[str]:
         """Extract GUID from .logarchive using macOS `log show` command"""
         self.log("[+] Searching for GUID in archive using 'log show'...", "info")
-        if not shutil.which("/usr/bin/log"):
+        if not self._bin["log"]:
             self.log("[-] '/usr/bin/log' not found — skipping log-show method", "warn")
             return None
         cmd = [
-            "/usr/bin/log", "show",
+            self._bin["log"], "show",
             "--archive", archive_path,
             "--info", "--debug",
             "--style", "syslog",
             "--predicate", f'process == "bookassetd" AND eventMessage CONTAINS "{self.BLDB_FILENAME}"'
         ]
-        code, stdout, stderr = self._run_cmd(cmd, timeout=self.timeouts['log_show_timeout'])
-        if code != 0:
-            self.log(f"[-] log show failed (code {code}): {stderr}", "error")
+        # stderr goes to a file: a pipe nobody drains until stdout EOF could fill up and stall `log show`
+        err_file = tempfile.TemporaryFile()
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err_file, text=True, bufsize=1,
+                                    encoding='utf-8', errors='replace')
+        except OSError as e:
+            err_file.close()
+            self.log(f"[-] log show failed to start: {e}", "error")
             return None
-        for line in stdout.splitlines():
-            if self.BLDB_FILENAME in line:
+        # Parse lines as they stream in and stop `log show` at the first GUID
+        watchdog = threading.Timer(self.timeouts['log_show_timeout'], proc.kill)
+        watchdog.start()
+        try:
+            for line in proc.stdout:
+                if self.BLDB_FILENAME not in line:
+                    continue
                 self.log("[+] Found relevant line", "info")
                 self.log(f" {line.strip()}", "info")
                 match = self.GUID_REGEX.search(line)
@@ -530,11 +800,30 @@ class MainWindow(QMainWindow):
                     guid = match.group(0).upper()
                     self.log(f"[✓] GUID extracted: {guid}", "success")
                     return guid
+        except Exception as e:
+            # e.g. the watchdog killed `log show`; let the caller fall back instead of ending the worker
+            self.log(f"[-] Reading log show output failed: {e}", "error")
+            return None
+        else:
+            if proc.wait() != 0:
+                err_file.seek(0)
+                err = err_file.read().decode(errors='replace').strip()
+                self.log(f"[-] log show failed (code {proc.returncode}): {err}", "error")
+                return None
+        finally:
+            watchdog.cancel()
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait()
+            proc.stdout.close()
+            err_file.close()
         self.log("[-] GUID not found in archive", "error")
         return None
 
     def get_guid_auto_new(self, max_attempts: int = 5) -> Optional[str]:
         """New automatic GUID detection using syslog archive + log show"""
+        os.makedirs(self._archive_dir, exist_ok=True)
+        archive_path = os.path.join(self._archive_dir, "ios_logs.logarchive")
         for attempt in range(1, max_attempts + 1):
             self.log(f"\n=== GUID Extraction (Attempt {attempt}/{max_attempts}) ===\n", "attempt")
             # Step 1: Reboot
@@ -551,18 +840,17 @@ class MainWindow(QMainWindow):
                     return None
                 self.log("[-] Device not found — retrying...", "warn")
                 continue
-            # Step 3: Collect & parse archive
-            with tempfile.TemporaryDirectory() as tmpdir:
-                archive_path = os.path.join(tmpdir, "ios_logs.logarchive")
-                if not self.collect_syslog_archive(archive_path, timeout=200):
-                    self.log("[-] Failed to collect syslog archive", "error")
-                    if attempt == max_attempts:
-                        return None
-                    continue
-                guid = self.extract_guid_from_archive(archive_path)
-                if guid and self.validate_guid_structure(guid):
-                    self.global_GUID = guid
-                    return guid
+            # Step 3: Collect & parse archive (replacing the previous attempt's one)
+            self._discard_tree(archive_path)
+            if not self.collect_syslog_archive(archive_path, timeout=200):
+                self.log("[-] Failed to collect syslog archive", "error")
+                if attempt == max_attempts:
+                    return None
+                continue
+            guid = self.extract_guid_from_archive(archive_path)
+            if guid and self.validate_guid_structure(guid):
+                self.global_GUID = guid
+                return guid
         self.log("[-] All attempts exhausted: GUID detection failed", "error")
         return None
 
@@ -580,74 +868,86 @@ class MainWindow(QMainWindow):
         print(f"\n⚠ GUID Input Required")
         print(" Format: XXXXXXXX-XXXX-XXXX-XXXX-XXXXXXXXXXXX")
         print(" Example: 2A22A82B-C342-444D-972F-5270FB5080DF")
-        UUID_PATTERN = re.compile(r'^[0-9A-F]{8}-[0-9A-F]{4}-[0-9A-F]{4}-[0-9A-F]{4}-[0-9A-F]{12}$', re.IGNORECASE)
         while True:
             guid_input = input("\n➤ Enter SystemGroup GUID: ").strip()
-            if UUID_PATTERN.match(guid_input):
+            if self.GUID_REGEX.fullmatch(guid_input):
                 return guid_input.upper()
             print("❌ Invalid format. Must be 8-4-4-4-12 hex chars (e.g. 2A22A82B-C342-444D-972F-5270FB5080DF).")
 
     def parse_tracev3_structure(self, data):
         """Search for known patterns in tracev3 file"""
+        # data.find() runs CPython's vectorized substring search (memchr-based), ~10x faster
+        # than a regex alternation, which has no literal prefix and steps byte by byte.
+        bldb, manager, sqlite_ = self.SIG_BLDB, self.SIG_BLDB_MANAGER, self.SIG_BLDB_SQLITE
         signatures = []
-        db_patterns = [
-            b'BLDatabaseManager',
-            b'BLDatabase',
-            b'BLDatabaseManager.sqlite',
-            b'bookassetd [Database]: Store is at file:///private/var/containers/Shared/SystemGroup',
-        ]
-        for pattern in db_patterns:
-            pos = 0
-            while True:
-                pos = data.find(pattern, pos)
-                if pos == -1:
-                    break
-                signatures.append(('string', pattern, pos))
-                pos += len(pattern)
+        pos = data.find(bldb)
+        while pos != -1:
+            signatures.append(('string', bldb, pos))
+            # BLDatabaseManager and BLDatabaseManager.sqlite start at the same offset
+            if data[pos:pos + len(manager)] == manager:
+                signatures.append(('string', manager, pos))
+                if data[pos:pos + len(sqlite_)] == sqlite_:
+                    signatures.append(('string', sqlite_, pos))
+            pos = data.find(bldb, pos + len(bldb))
+        store = self.SIG_BOOKASSETD_STORE
+        pos = data.find(store)
+        while pos != -1:
+            signatures.append(('string', store, pos))
+            pos = data.find(store, pos + len(store))
         return signatures
 
-    def extract_guid_candidates(self, data, context_pos, window_size=512):
-        """Extract GUID candidates near a context position"""
+    def index_guid_matches(self, data, positions=None):
+        """
+        Scan for valid GUIDs once, return [(start, end, guid)] sorted by offset.
+        With positions, only the merged GUID_WINDOW spans around them are scanned, each byte at most once.
+        """
+        if positions is None:
+            spans = [[0, len(data)]]
+        else:
+            spans = []
+            for pos in sorted(positions):
+                start, end = max(0, pos - GUID_WINDOW), min(len(data), pos + GUID_WINDOW)
+                if spans and start <= spans[-1][1]:
+                    spans[-1][1] = max(spans[-1][1], end)
+                else:
+                    spans.append([start, end])
+        matches = []
+        for span_start, span_end in spans:
+            last_end = span_start
+            for off in range(span_start, span_end, GUID_SCAN_CHUNK):
+                chunk_end = min(off + GUID_SCAN_CHUNK + GUID_SCAN_OVERLAP, span_end)
+                chunk = data[off:chunk_end].translate(HEX_UPPER)
+                # Resume after the previous match; matches starting in the overlap belong to the next chunk
+                for match in self.GUID_BYTES_REGEX.finditer(chunk, max(0, last_end - off)):
+                    if match.start() >= GUID_SCAN_CHUNK:
+                        break
+                    last_end = off + match.end()
+                    matches.append((off + match.start(), last_end, match.group(0).decode('ascii')))
+        return matches
+
+    def extract_guid_candidates(self, data, context_pos, guid_matches):
+        """Extract GUID candidates near a context position from index_guid_matches() output"""
+        start = max(0, context_pos - GUID_WINDOW)
+        end = min(len(data), context_pos + GUID_WINDOW)
+        # Matches are non-overlapping, so both starts and ends are sorted
+        first = bisect.bisect_left(guid_matches, start, key=lambda m: m[0])
+        last = bisect.bisect_right(guid_matches, end, key=lambda m: m[1])
+        if first >= last:
+            return []
         candidates = []
-        guid_pattern = re.compile(
-            rb'([0-9A-F]{8}[-][0-9A-F]{4}[-][0-9A-F]{4}[-][0-9A-F]{4}[-][0-9A-F]{12})',
-            re.IGNORECASE
-        )
-        start = max(0, context_pos - window_size)
-        end = min(len(data), context_pos + window_size)
-        context_data = data[start:end]
-        for match in guid_pattern.finditer(context_data):
-            guid = match.group(1).decode('ascii').upper()
-            relative_pos = match.start() + start - context_pos
-            if self.validate_guid_structure(guid):
+        # Zero-copy window; released on exit so no view outlives the mmap
+        with memoryview(data)[start:end] as context_data:
+            for m_start, m_end, guid in guid_matches[first:last]:
                 candidates.append({
                     'guid': guid,
-                    'position': relative_pos,
-                    'context': self.get_context_string(context_data, match.start(), match.end())
+                    'position': m_start - context_pos,
+                    'context': self.get_context_string(context_data, m_start - start, m_end - start)
                 })
         return candidates
 
     def validate_guid_structure(self, guid):
         """Validate GUID conforms to RFC 4122 (version 4, variant 1)"""
-        try:
-            parts = guid.split('-')
-            if len(parts) != 5:
-                return False
-            if not (len(parts[0]) == 8 and len(parts[1]) == len(parts[2]) == len(parts[3]) == 4 and len(parts[4]) == 12):
-                return False
-            hex_chars = set('0123456789ABCDEF')
-            clean = guid.replace('-', '')
-            if not all(c in hex_chars for c in clean):
-                return False
-            # Version must be 4
-            if parts[2][0] != '4':
-                return False
-            # Variant must be 8/9/A/B
-            if parts[3][0] not in '89AB':
-                return False
-            return True
-        except Exception:
-            return False
+        return isinstance(guid, str) and self.GUID_V4_REGEX.fullmatch(guid) is not None
 
     def get_context_string(self, data, start, end, context_size=50):
         """Extract readable context around binary match"""
@@ -655,28 +955,30 @@ class MainWindow(QMainWindow):
         context_end = min(len(data), end + context_size)
         context = data[context_start:context_end]
         try:
-            return context.decode('utf-8', errors='replace')
+            return str(context, 'utf-8', errors='replace')  # bytes or memoryview
         except:
             return binascii.hexlify(context).decode('ascii')
 
-    def analyze_guid_confidence(self, guid_candidates):
-        """Score & rank GUID candidates by recurrence and proximity"""
+    def analyze_guid_confidence(self, guid_candidates, top: int = 5):
+        """Score & rank GUID candidates by recurrence and proximity, return the best `top`"""
         if not guid_candidates:
             return None
-        guid_counts = Counter(candidate['guid'] for candidate in guid_candidates)
-        scored_guids = []
-        for guid, count in guid_counts.items():
-            score = count * 10
-            positions = [c['position'] for c in guid_candidates if c['guid'] == guid]
-            close_positions = [p for p in positions if abs(p) < 100]
-            if close_positions:
-                score += len(close_positions) * 5
-            before_positions = [p for p in positions if p < 0]
-            if before_positions:
-                score += len(before_positions) * 3
-            scored_guids.append((guid, score, count))
-        scored_guids.sort(key=lambda x: x[1], reverse=True)
-        return scored_guids
+        # guid -> [occurrences, within 100 bytes, before the signature], in one pass
+        stats = {}
+        for candidate in guid_candidates:
+            acc = stats.setdefault(candidate['guid'], [0, 0, 0])
+            pos = candidate['position']
+            acc[0] += 1
+            if abs(pos) < 100:
+                acc[1] += 1
+            if pos < 0:
+                acc[2] += 1
+        scored_guids = (
+            (guid, count * 10 + close * 5 + before * 3, count)
+            for guid, (count, close, before) in stats.items()
+        )
+        # Same order as a stable descending sort, without ranking the whole tail
+        return heapq.nlargest(top, scored_guids, key=lambda x: x[1])
 
     def confirm_guid_manual(self, guid):
         """Prompt user to confirm low-confidence GUID (auto-confirm in GUI mode → 'y')"""
@@ -689,11 +991,11 @@ class MainWindow(QMainWindow):
         """Legacy tracev3 parsing with confidence scoring"""
         self.attempt_count += 1
         self.log(f"GUID search attempt {self.attempt_count}/{self.max_attempts}", "attempt")
-        udid = self.UDID.text().replace("UDID: ", "")
+        udid = self.device_info.get("UniqueDeviceID", "device")
         log_path = f"{udid}.logarchive"
         try:
             self.activateButton.setText(f"⏳ Searching GUID (Attempt {self.attempt_count} / {self.max_attempts}) ...")
-            code, _, err = self._run_cmd(["pymobiledevice3", "syslog", "collect", log_path], timeout=120)
+            code, _, err = self._run_cmd([self._bin["pymobiledevice3"], "syslog", "collect", log_path], timeout=120)
             if code != 0:
                 self.log(f"Log collection failed: {err}", "error")
                 return None
@@ -701,19 +1003,23 @@ class MainWindow(QMainWindow):
             if not os.path.exists(trace_file):
                 self.log("tracev3 file not found", "error")
                 return None
-            with open(trace_file, 'rb') as f:
-                data = f.read()
-            size_mb = len(data) / (1024 * 1024)
-            self.log(f"Analyzing tracev3 ({size_mb:.1f} MB)...", "info")
-            signatures = self.parse_tracev3_structure(data)
-            self.log(f"Found {len(signatures)} relevant signatures", "info")
-            all_candidates = []
-            for sig_type, pattern, pos in signatures:
-                if pattern == b'BLDatabaseManager':
-                    candidates = self.extract_guid_candidates(data, pos)
-                    all_candidates.extend(candidates)
-                    if candidates:
-                        self.log(f"Found {len(candidates)} GUID candidates near BLDatabaseManager at 0x{pos:x}", "info")
+            with mmap_file(trace_file) as data:
+                size_mb = len(data) / (1024 * 1024)
+                self.log(f"Analyzing tracev3 ({size_mb:.1f} MB)...", "info")
+                signatures = self.parse_tracev3_structure(data)
+                self.log(f"Found {len(signatures)} relevant signatures", "info")
+                all_candidates = []
+                # One GUID scan over the signature windows; each signature then looks up its own
+                guid_matches = []
+                positions = [pos for _, pattern, pos in signatures if pattern == self.SIG_BLDB_MANAGER]
+                if positions:
+                    guid_matches = self.index_guid_matches(data, positions)
+                for sig_type, pattern, pos in signatures:
+                    if pattern == self.SIG_BLDB_MANAGER:
+                        candidates = self.extract_guid_candidates(data, pos, guid_matches)
+                        all_candidates.extend(candidates)
+                        if candidates:
+                            self.log(f"Found {len(candidates)} GUID candidates near BLDatabaseManager at 0x{pos:x}", "info")
             if not all_candidates:
                 self.log("No valid GUID candidates found", "error")
                 return None
@@ -721,7 +1027,7 @@ class MainWindow(QMainWindow):
             if not scored_guids:
                 return None
             self.log("GUID confidence analysis:", "info")
-            for guid, score, count in scored_guids[:5]:
+            for guid, score, count in scored_guids:
                 self.log(f" {guid}: score={score}, occurrences={count}", "info")
             best_guid, best_score, best_count = scored_guids[0]
             if best_score >= 30:
@@ -739,8 +1045,7 @@ class MainWindow(QMainWindow):
                     return None
             return best_guid
         finally:
-            if os.path.exists(log_path):
-                shutil.rmtree(log_path)
+            self._discard_tree(log_path)
 
     def get_guid_auto_with_retry(self):
         """Retry enhanced GUID extraction up to max_attempts"""
@@ -765,12 +1070,13 @@ class MainWindow(QMainWindow):
         params = f"prd={prd}&guid={guid}&sn={sn}"
         url = f"{self.api_url}?{params}"
         self.log(text=f"Requesting all URLs from server: {url}", type="info")
-        code, out, err = self._run_cmd(["curl", "-s", "-k", url])
-        if code != 0:
-            self.log(text=f"Server request failed: {err}", type="error")
+        try:
+            r = self.http.get(url, timeout=15)
+        except requests.RequestException as e:
+            self.log(text=f"Server request failed: {e}", type="error")
             return None, None, None
         try:
-            data = json.loads(out)
+            data = r.json()
             if data.get('success'):
                 stage1_url = data['links']['step1_fixedfile']
                 stage2_url = data['links']['step2_bldatabase']
@@ -779,7 +1085,7 @@ class MainWindow(QMainWindow):
             else:
                 self.log(text="Server returned error response", type="error")
                 return None, None, None
-        except json.JSONDecodeError:
+        except ValueError:  # requests' JSONDecodeError
             self.log(text="Server did not return valid JSON", type="error")
             return None, None, None
 
@@ -787,7 +1093,9 @@ class MainWindow(QMainWindow):
         """Download payload stage to /tmp and clean up"""
         self.log(f"Pre-loading: {stage_name}...", "info")
         filename = f"temp_{stage_name}"
-        result = self._curl_download(stage_url, filename)
+        # Runs in parallel with the other stages: own session, and no widget access off the GUI thread
+        with http_session() as session:
+            result = self._curl_download(stage_url, filename, session)
         if result:
             self.log(f"Successfully pre-loaded {stage_name}", "success")
             try:
@@ -797,9 +1105,6 @@ class MainWindow(QMainWindow):
             return True
         else:
             self.log(f"Warning: Failed to pre-load {stage_name}", "warning")
-            self.activateButton.setText("❌ Failed to preload payload!")
-            self.pb.setStyleSheet("background-color: rgb(252, 0, 6); border-radius: 5px;")
-            QApplication.processEvents()
             return False
 
     ###############
@@ -822,9 +1127,27 @@ class MainWindow(QMainWindow):
             msg_box.setIcon(QMessageBox.Warning)
         msg_box.exec_()
 
+    def _showError(self, text: str):
+        self.activateButton.setText(text)
+        self.pb.setStyleSheet("background-color: rgb(252, 0, 6); border-radius: 5px;")
+
+    def askReboot(self, text: str, done: threading.Event):
+        """GUI-thread side of a manual reboot request"""
+        try:
+            self.showPopup("Manual reboot required", text, "warning")
+        finally:
+            done.set()
+
     def pull_file(self, remote: str, local: str) -> bool:
-        code, _, _ = self._run_cmd(["pymobiledevice3", "afc", "pull", remote, local])
-        return code == 0 and os.path.exists(local) and os.path.getsize(local) > 0
+        try:
+            data = self._afc_call("get_file_contents", remote)
+        except Exception:
+            return False
+        if not data:
+            return False
+        with open(local, 'wb') as f:
+            f.write(data)
+        return True
 
     def push_file(self, local: str, remote: str, keep_local=True) -> bool:
         """Загрузка файла на устройство"""
@@ -835,17 +1158,18 @@ class MainWindow(QMainWindow):
         file_size = os.path.getsize(local)
         self.log(f"  File size: {file_size} bytes", "detail")
         self.rm_file(remote)
-        time.sleep(1)
-        code, out, err = self._run_cmd(["pymobiledevice3", "afc", "push", local, remote])
-        if code != 0:
-            self.log(f"❌ Push failed - Code: {code}", "error")
-            if err:
-                self.log(f"  stderr: {err[:200]}", "detail")
+        try:
+            with open(local, 'rb') as f:
+                self._afc_call("set_file_contents", remote, f.read())
+        except Exception as e:
+            self.log(f"❌ Push failed: {e}", "error")
             return False
-        time.sleep(2)
-        remote_dir = os.path.dirname(remote)
-        code_list, list_out, _ = self._run_cmd(["pymobiledevice3", "afc", "ls", remote_dir])
-        if remote in list_out or os.path.basename(remote) in list_out:
+        # The write handle is closed by now, so a stat sees the final size
+        try:
+            remote_size = int(self._afc_call("stat", remote)["st_size"])
+        except Exception:
+            remote_size = -1
+        if remote_size == file_size:
             self.log(f"✅ File confirmed on device at {remote}", "success")
             if not keep_local:
                 try:
@@ -855,12 +1179,32 @@ class MainWindow(QMainWindow):
                     pass
             return True
         else:
-            self.log(f"❌ File not found after push in {remote_dir}", "error")
+            self.log(f"❌ File missing or incomplete after push ({remote_size}/{file_size} bytes)", "error")
             return False
 
+    def wait_for_remote_file(self, remote: str, timeout: int = 60) -> bool:
+        """Poll AFC until remote exists with a non-zero size that held across two polls"""
+        deadline = time.monotonic() + timeout
+        last_size = -1
+        while time.monotonic() < deadline:
+            try:
+                size = int(self._afc_call("stat", remote)["st_size"])
+            except Exception:  # not created yet, or lockdown still coming up after reboot
+                size = -1
+            if size > 0 and size == last_size:
+                return True
+            last_size = size
+            time.sleep(1)
+        return False
+
     def rm_file(self, remote: str) -> bool:
-        code, _, _ = self._run_cmd(["pymobiledevice3", "afc", "rm", remote])
-        return code == 0 or "ENOENT" in _
+        try:
+            self._afc_call("rm", remote)
+        except AfcFileNotFoundError:
+            pass
+        except Exception:
+            return False
+        return True
 
     def Hacktivating(self):
         """Main activation workflow thread"""
@@ -869,33 +1213,34 @@ class MainWindow(QMainWindow):
         self.activateButton.setText("⏳ Connecting to device...")
         QApplication.processEvents()
 
-        process = subprocess.Popen(['ideviceinfo'], stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                                   stdin=subprocess.PIPE, text=True, bufsize=1)
-        output = str(process.stdout.read())
-        process.terminate()
+        # Values were read by SearchingDevices; re-read them only if a different device is attached now
+        info = self.device_info
+        attached = self._attached_udids()
+        if attached and info.get("UniqueDeviceID") not in attached:
+            self.log("Attached device changed — re-reading device info", "warn")
+            try:
+                info = self.device_info = self._await(read_device_values(), timeout=30)
+                self.deviceFoundSignal.emit(info)
+            except Exception as e:
+                info = {}
+                self.log(f"Lockdown error: {str(e) or 'Unknown'}", "error")
         self.setProgress(10)
 
-        if "ERROR: No device found!" in output:
-            self.log("Failed to connect to device!", "error")
-            self.log("Process finished with error.", "error")
-            self.pb.setStyleSheet("background-color: rgb(252, 0, 6); border-radius: 5px;")
-            self.activateButton.setText("❌ Failed to connect to device")
-            QApplication.processEvents()
-            return
-        elif "ProductType" in output:
+        if "ProductType" in info and attached:
             self.log("Successfully connected to device!", "success")
         else:
             self.log("Failed to connect to device!", "error")
+            self.log("Process finished with error.", "error")
             self.pb.setStyleSheet("background-color: rgb(252, 0, 6); border-radius: 5px;")
             self.activateButton.setText("❌ Failed to connect to device")
             QApplication.processEvents()
             return
 
         try:
-            prd = output.split("ProductType: ")[1].split("\n")[0]
-            sn = output.split("SerialNumber: ")[1].split("\n")[0]
-        except Exception as e:
-            self.log(f"Failed to parse device info: {e}", "error")
+            prd = info["ProductType"]
+            sn = info["SerialNumber"]
+        except KeyError as e:
+            self.log(f"Failed to parse device info: missing {e}", "error")
             return
 
         self.activateButton.setText("⏳ Searching GUID (Attempt 1) ...")
@@ -921,9 +1266,11 @@ class MainWindow(QMainWindow):
 
         self.activateButton.setText("⏳ Pre-loading payload...")
         QApplication.processEvents()
-        for stage_name, stage_url in [("stage1", stage1_url), ("stage2", stage2_url), ("stage3", stage3_url)]:
-            self.preload_stage(stage_name, stage_url)
-            time.sleep(1)
+        # Independent downloads: fetch all three at once
+        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as pool:
+            preloaded = list(pool.map(self.preload_stage, ("stage1", "stage2", "stage3"), (stage1_url, stage2_url, stage3_url)))
+        if not all(preloaded):
+            self.errorSignal.emit("❌ Failed to preload payload!")
         self.setProgress(35)
 
         self.log("Downloading final payload...", "info")
@@ -938,37 +1285,51 @@ class MainWindow(QMainWindow):
         self.setProgress(45)
 
         self.log("Validating payload database...", "info")
+        conn = None
         try:
-            conn = sqlite3.connect(full_db_path)
+            # Read-only and immutable (nothing else writes the fresh download): no journal,
+            # WAL or locking; pages are read through mmap
+            conn = sqlite3.connect(f"{Path(full_db_path).as_uri()}?mode=ro&immutable=1", uri=True)
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA cache_size=-32768")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            check = conn.execute("PRAGMA quick_check").fetchone()[0]
+            if check != "ok":
+                raise Exception(f"Invalid DB - integrity check failed: {check}")
             res = conn.execute("SELECT count(*) FROM sqlite_master WHERE type='table' AND name='asset'")
             if res.fetchone()[0] == 0:
                 raise Exception("Invalid DB - no asset table found")
-            res = conn.execute("SELECT COUNT(*) FROM asset")
-            count = res.fetchone()[0]
+            count, = conn.execute("SELECT COUNT(*) FROM asset").fetchone()
             if count == 0:
                 raise Exception("Invalid DB - no records in asset table")
             self.log(f"Database validation passed — {count} records", "info")
-            for row in conn.execute("SELECT pid, url, local_path FROM asset"):
+            for row in conn.execute("SELECT pid, url, local_path FROM asset LIMIT 5"):
                 self.log(f"Record {row[0]}: {row[1]} → {row[2]}", "info")
+            if count > 5:
+                self.log(f"... and {count - 5} more", "info")
         except Exception as e:
             self.log(f"Invalid payload received: {e}", "error")
             self.activateButton.setText("❌ Invalid Payload!")
             self.pb.setStyleSheet("background-color: rgb(252, 0, 6); border-radius: 5px;")
             return
         finally:
-            conn.close()
+            if conn is not None:
+                conn.close()
         self.setProgress(50)
 
         self.activateButton.setText("⏳ Uploading Payload...")
         QApplication.processEvents()
         target = "/Downloads/downloads.28.sqlitedb"
-        self.rm_file("/Downloads/downloads.28.sqlitedb")
-        self.rm_file("/Downloads/downloads.28.sqlitedb-wal")
-        self.rm_file("/Downloads/downloads.28.sqlitedb-shm")
-        self.rm_file("/Books/asset.epub")
-        self.rm_file("/Books/iTunesMetadata.plist")
-        self.rm_file("/iTunes_Control/iTunes/iTunesMetadata.plist")
-        self.rm_file("/iTunes_Control/iTunes/iTunesMetadata.plist.ext")
+        cleanup_files = [
+            "/Downloads/downloads.28.sqlitedb-wal",
+            "/Downloads/downloads.28.sqlitedb-shm",
+            "/Books/asset.epub",
+            "/Books/iTunesMetadata.plist",
+            "/iTunes_Control/iTunes/iTunesMetadata.plist",
+            "/iTunes_Control/iTunes/iTunesMetadata.plist.ext"
+        ]
+        for stale in (target, *cleanup_files):
+            self.rm_file(stale)
         if not self.push_file(full_db_path, target):
             try:
                 os.remove(full_db_path)
@@ -983,23 +1344,14 @@ class MainWindow(QMainWindow):
 
         self.activateButton.setText("⏳ Cleaning up files...")
         self.log("Cleaning up WAL/SHM and auxiliary files in /Downloads /Books /iTunes_Control...", "info")
-        cleanup_files = [
-            "/Downloads/downloads.28.sqlitedb-wal",
-            "/Downloads/downloads.28.sqlitedb-shm",
-            "/Books/asset.epub",
-            "/Books/iTunesMetadata.plist",
-            "/iTunes_Control/iTunes/iTunesMetadata.plist",
-            "/iTunes_Control/iTunes/iTunesMetadata.plist.ext"
-        ]
         for wal_file in cleanup_files:
-            code, _, err = self._run_cmd(["pymobiledevice3", "afc", "rm", wal_file])
-            if code == 0:
-                self.log(f"Removed {wal_file} via pymobiledevice3", "info")
-            else:
-                if "ENOENT" not in err and "No such file" not in err:
-                    self.log(f"Warning removing {wal_file}: {err}", "warn")
-                else:
-                    self.log(f"{wal_file} not present — OK", "info")
+            try:
+                self._afc_call("rm", wal_file)
+                self.log(f"Removed {wal_file} via AFC", "info")
+            except AfcFileNotFoundError:
+                self.log(f"{wal_file} not present — OK", "info")
+            except Exception as e:
+                self.log(f"Warning removing {wal_file}: {e}", "warn")
         self.setProgress(65)
 
         self.log("🔄 STAGE 1: First reboot + copy to /Books/...", "info")
@@ -1007,13 +1359,12 @@ class MainWindow(QMainWindow):
         QApplication.processEvents()
         if not self.reboot_device():
             self.log("⚠ First reboot failed — continuing anyway", "warn")
-        self.log("Waiting 30 seconds for iTunesMetadata.plist to regenerate...", "info")
-        self.activateButton.setText("⏳ Waiting for iTunesMetadata.plist")
-        for _ in range(10):
-            time.sleep(5)
-            self.log(" ▫ Waiting...", "info")
         src = "/iTunes_Control/iTunes/iTunesMetadata.plist"
         dst_books = "/Books/iTunesMetadata.plist"
+        self.log("Waiting for iTunesMetadata.plist to regenerate...", "info")
+        self.activateButton.setText("⏳ Waiting for iTunesMetadata.plist")
+        if not self.wait_for_remote_file(src, timeout=60):
+            self.log("⚠ iTunesMetadata.plist did not settle within 60s", "warn")
         tmp = os.path.join(self.temp_dir, "temp_plist_copy.plist")
         self.log(f"Copying {src} → {dst_books}...", "info")
         if self.pull_file(src, tmp):
@@ -1034,6 +1385,8 @@ class MainWindow(QMainWindow):
         self.log("🔄 STAGE 2: Second reboot + copy back to /iTunes_Control/...", "info")
         if not self.reboot_device():
             self.log("⚠ Second reboot failed — continuing anyway", "warn")
+        # Fixed settle: the /Books plist is the one we pushed before the reboot, so polling it proves
+        # nothing, and the device writes no new artifact here that could be waited on instead
         time.sleep(10)
         self.activateButton.setText("⏳ Copying to /iTunesControl/")
         self.setProgress(85)
@@ -1053,6 +1406,7 @@ class MainWindow(QMainWindow):
         self.log("⏸ Holding 30s for bookassetd processing...", "info")
         self.activateButton.setText("⏳ Waiting for bookassetd...")
         self.setProgress(90)
+        # bookassetd leaves no file on the AFC side to poll, so this stays a fixed hold
         time.sleep(30)
 
         self.activateButton.setText("✅ Done! Activate your device as usual.")
@@ -1063,57 +1417,92 @@ class MainWindow(QMainWindow):
         self.Done.show()
 
     def setProgress(self, progress: float):
-        """Animate progress bar"""
-        new_width = round(progress * 5.04)  # 504px / 100%
-        step = 1 if new_width > self.pb.width() else -1
-        while self.pb.width() != new_width:
-            time.sleep(0.004)
-            self.pb.setFixedWidth(self.pb.width() + step)
-            QApplication.processEvents()
-
-    def SearchingDevices(self):
-        """Background thread: wait for device connection and populate HomePage"""
+        """Animate progress bar (returns immediately, safe from worker threads)"""
+        self.progressSignal.emit(round(progress * 5.04))  # 504px / 100%
+
+    def _animateProgress(self, width: int):
+        self._pb_anim.stop()
+        self._pb_anim.setStartValue(self.pb.geometry())
+        self._pb_anim.setEndValue(QRect(0, 0, width, self.pb.height()))
+        self._pb_anim.start()
+
+    async def watchDevices(self):
+        """Device watcher task: follow usbmuxd attach/detach events, hand lockdown values to the GUI thread"""
+        changed = asyncio.Event()
         while True:
-            process = subprocess.Popen(['ideviceinfo'], stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                                       stdin=subprocess.PIPE, text=True, bufsize=1)
-            output = str(process.stdout.read())
-            process.terminate()
-            if "ERROR: No device found!" in output:
-                self.label_status.setText("⏳ Searching for devices...")
-            else:
-                self.label_status.setText("✅ Connected!")
-                time.sleep(0.3)
-                try:
-                    ProductVersion = output.split("ProductVersion: ")[1].split("\n")[0]
-                    ProductType = output.split("ProductType: ")[1].split("\n")[0]
-                    UDID = output.split("UniqueDeviceID: ")[1].split("\n")[0]
-                    DeviceName = output.split("DeviceName: ")[1].split("\n")[0]
-                    ActivationState = output.split("ActivationState: ")[1].split("\n")[0]
-                except Exception as e:
-                    self.log(f"Could not parse device info: {e}", "error")
-                    self.showPopup("Error", "Could not get device info!", "warning")
-                    break
-                self.log("Device connected!", "success")
-                self.log(f"Detected device:\n iOS Version: {ProductVersion}\n Product Type: {ProductType}\n UDID: {UDID}\n Device Name: {DeviceName}", "none")
-                self.Intro.hide()
-                self.HomePage.show()
-                self.DeviceName.setText(f"📱 {DeviceName}")
-                self.UDID.setText(f"UDID: {UDID}")
-                self.iOSVersion.setText(f"iOS Version: {ProductVersion}")
-                self.ProductType.setText(f"Product Type: {ProductType}")
-                self.ActivationState.setText(f"Activation State: {ActivationState}")
-                supported_versions = {"26.0.1", "26.0", "18.7.2", "18.7.1"}
-                if ProductVersion in supported_versions:
-                    self.log("Device is SUPPORTED!", "success")
-                    self.activateButton.setText("🚀 Activate device!")
-                    self.activateButton.setStyleSheet("""
-                    background-color: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0, stop:0 rgba(21, 151, 255, 255), stop:1 rgba(113, 163, 168, 255));
-                    color: rgb(255, 255, 255);
-                    border-radius: 15px;
-                    """)
-                    self.ProductType_3.setText("SUPPORTED!")
-                    self.ProductType_3.setStyleSheet("color: rgb(34, 255, 16); background-color: rgba(255, 255, 255, 0);")
-                break    
+            try:
+                mux = await create_mux()
+            except Exception:
+                await asyncio.sleep(1)  # usbmuxd not reachable (yet)
+                continue
+            listener = None
+            try:
+                await mux.listen()
+
+                async def follow():
+                    # usbmuxd first reports the devices already attached, then every change
+                    while True:
+                        await mux.receive_device_state_update()
+                        changed.set()
+
+                listener = asyncio.create_task(follow())
+                while not listener.done():
+                    changed.clear()
+                    if not mux.devices:
+                        waiter = asyncio.ensure_future(changed.wait())
+                        await asyncio.wait({listener, waiter}, return_when=asyncio.FIRST_COMPLETED)
+                        waiter.cancel()
+                        continue
+                    try:
+                        info = await asyncio.wait_for(read_device_values(), timeout=10)
+                    except Exception:
+                        # Attached but lockdownd not answering yet (locked, Trust prompt): retry while it stays attached
+                        await asyncio.sleep(0.5)
+                        continue
+                    self.deviceFoundSignal.emit(info)
+                    return
+                listener.result()  # re-raise why the listener stopped
+            except Exception:
+                await asyncio.sleep(1)  # listener connection dropped (usbmuxd restarted): start over
+            finally:
+                if listener is not None:
+                    listener.cancel()
+                await mux.close()
+
+    def SearchingDevices(self, info: dict):
+        """GUI-thread side of the device watcher: populate HomePage for the connected device"""
+        self.label_status.setText("✅ Connected!")
+        self.device_info = info
+        try:
+            ProductVersion = info["ProductVersion"]
+            ProductType = info["ProductType"]
+            UDID = info["UniqueDeviceID"]
+            DeviceName = info["DeviceName"]
+            ActivationState = info["ActivationState"]
+        except KeyError as e:
+            self.log(f"Could not parse device info: {e}", "error")
+            self.showPopup("Error", "Could not get device info!", "warning")
+            return
+        self.log("Device connected!", "success")
+        self.log(f"Detected device:\n iOS Version: {ProductVersion}\n Product Type: {ProductType}\n UDID: {UDID}\n Device Name: {DeviceName}", "none")
+        self.Intro.hide()
+        self.HomePage.show()
+        self.DeviceName.setText(f"📱 {DeviceName}")
+        self.UDID.setText(f"UDID: {UDID}")
+        self.iOSVersion.setText(f"iOS Version: {ProductVersion}")
+        self.ProductType.setText(f"Product Type: {ProductType}")
+        self.ActivationState.setText(f"Activation State: {ActivationState}")
+        if ProductVersion in SUPPORTED_VERSIONS:
+            self.log("Device is SUPPORTED!", "success")
+            self.activateButton.setText("🚀 Activate device!")
+            self.activateButton.setStyleSheet("""
+            background-color: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0, stop:0 rgba(21, 151, 255, 255), stop:1 rgba(113, 163, 168, 255));
+            color: rgb(255, 255, 255);
+            border-radius: 15px;
+            """)
+            self.ProductType_3.setText("SUPPORTED!")
+            self.ProductType_3.setStyleSheet("color: rgb(34, 255, 16); background-color: rgba(255, 255, 255, 0);")
+
     def log(self, text: str, type: str = "info"):
         """Log to GUI console and stdout"""
         colors = {
@@ -1139,11 +1528,8 @@ class MainWindow(QMainWindow):
         }.get(type, "•")
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
         line = f'<span style="color:{color};">[{timestamp}] {prefix} {text}</span>'
-        if hasattr(self, 'console'):
-            self.console.append(line)
-            scrollbar = self.console.verticalScrollBar()
-            scrollbar.setValue(scrollbar.maximum())
-            QApplication.processEvents()
+        if hasattr(self, '_log_buf'):
+            self._log_buf.append(line)
         print(f"[{timestamp}] {prefix} {text}")
 
     def retranslateUi(self, MainWindow):
@@ -1157,5 +1543,6 @@ if __name__ == "__main__":
     app.setApplicationName("Rust A12+")
 
     window = MainWindow()
+    app.aboutToQuit.connect(window._cleanup)
     window.show()
     sys.exit(app.exec())
\ No newline at end of file